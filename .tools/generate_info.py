@@ -21,17 +21,19 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import functools
 import json
+import os
 import re
-import string
-import subprocess
 import sys
 import typing
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from types import SimpleNamespace
 
 import parso
+import yaml
 from redbot import VersionInfo
 from strictyaml import (
     Bool,
@@ -52,39 +54,46 @@ from strictyaml.exceptions import YAMLSerializationError, YAMLValidationError
 from strictyaml.utils import is_string
 from strictyaml.yamllocation import YAMLChunk
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 ROOT_PATH = Path(__file__).absolute().parent.parent
 
-# `FormatPlaceholder`, `FormatDict` and `safe_format_alt` taken from
-# https://stackoverflow.com/posts/comments/100958805
+_SHARED_FIELDS_PLACEHOLDER_RE = re.compile(
+    r"\{shared_fields(?:\.([A-Za-z_]\w*)|\[([^\]]+)\])\}"
+)
 
 
-class FormatPlaceholder:
-    def __init__(self, key):
-        self.key = key
+def safe_format_alt(text, source):
+    """Substitute `{shared_fields.x}` / `{shared_fields[x]}` placeholders in `text`.
 
-    def __format__(self, spec):
-        result = self.key
-        if spec:
-            result += ":" + spec
-        return "{" + result + "}"
+    Unknown placeholders and all other braces are left untouched, so the
+    result can still go through a regular `.format_map` call afterwards.
+    """
+    shared_fields_namespace = source["shared_fields"]
 
-    def __getitem__(self, index):
-        self.key = f"{self.key}[{index}]"
-        return self
+    def replace(match):
+        key = match.group(1) or match.group(2)
+        return str(getattr(shared_fields_namespace, key, match.group(0)))
 
-    def __getattr__(self, attr):
-        self.key = f"{self.key}.{attr}"
-        return self
+    return _SHARED_FIELDS_PLACEHOLDER_RE.sub(replace, text)
 
 
-class FormatDict(dict):
-    def __missing__(self, key):
-        return FormatPlaceholder(key)
+# resolved shared-field templates by original string - cogs often share these
+_shared_fields_format_cache: typing.Dict[str, str] = {}
 
 
-def safe_format_alt(text, source):
-    formatter = string.Formatter()
-    return formatter.vformat(text, (), FormatDict(source))
+def _format_shared_fields(text: str, shared_fields_namespace: SimpleNamespace) -> str:
+    if "{shared_fields" not in text:
+        return text
+    try:
+        return _shared_fields_format_cache[text]
+    except KeyError:
+        result = safe_format_alt(text, {"shared_fields": shared_fields_namespace})
+        _shared_fields_format_cache[text] = result
+        return result
 
 
 class PythonVersion(ScalarValidator):
@@ -175,19 +184,179 @@ AUTOLINT_SHARED_FIELDS_KEYS_ORDER = [
 ]
 
 AUTOLINT_COG_KEYS_ORDER = [getattr(key, "key", key) for key in COG_KEYS]
+AUTOLINT_REPO_RANK = {key: idx for idx, key in enumerate(AUTOLINT_REPO_KEYS_ORDER)}
+AUTOLINT_SHARED_FIELDS_RANK = {
+    key: idx for idx, key in enumerate(AUTOLINT_SHARED_FIELDS_KEYS_ORDER)
+}
+AUTOLINT_COG_RANK = {key: idx for idx, key in enumerate(AUTOLINT_COG_KEYS_ORDER)}
+
+
+class FastValidationError(Exception):
+    """Raised when document doesn't pass the fast-path validation."""
+
+
+def _section_spec(
+    keys: dict,
+) -> typing.Tuple[typing.Set[str], typing.Set[str], typing.Dict[str, typing.Any]]:
+    """Split a schema key dict into (known, required, optional defaults)."""
+    known = set()
+    required = set()
+    defaults = {}
+    for key in keys:
+        if isinstance(key, Optional):
+            known.add(key.key)
+            if key.default is not None:
+                defaults[key.key] = key.default
+        else:
+            known.add(key)
+            required.add(key)
+    return known, required, defaults
+
+
+_REPO_SPEC = _section_spec(REPO_KEYS)
+_SHARED_FIELDS_SPEC = _section_spec(SHARED_FIELDS_KEYS)
+_COG_SPEC = _section_spec(COG_KEYS)
+
+
+def _prepare_section(
+    section: typing.Any,
+    spec: typing.Tuple[typing.Set[str], typing.Set[str], typing.Dict[str, typing.Any]],
+) -> dict:
+    """Check the section's keys against the spec and fill in optional defaults."""
+    known, required, defaults = spec
+    if not isinstance(section, dict):
+        raise FastValidationError("expected a mapping")
+    if not required <= section.keys() <= known:
+        raise FastValidationError("section doesn't match expected keys")
+    validated = dict(section)
+    for key, default in defaults.items():
+        validated.setdefault(key, default)
+    return validated
+
+
+def _validate_str(section: dict, key: str) -> None:
+    if not isinstance(section[key], str):
+        raise FastValidationError(f"expected a string for `{key}`")
+
+
+def _validate_str_list(section: dict, key: str) -> None:
+    value = section[key]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise FastValidationError(f"expected a list of strings for `{key}`")
+
+
+def _validate_common_keys(validated: dict) -> None:
+    for key in ("min_bot_version", "max_bot_version"):
+        value = validated.get(key)
+        if value is not None and (
+            not isinstance(value, str)
+            or not re.fullmatch(VersionInfo._VERSION_STR_PATTERN, value)
+        ):
+            raise FastValidationError(f"expected a bot version for `{key}`")
+    value = validated.get("min_python_version")
+    if value is not None:
+        match = PythonVersion.REGEX.fullmatch(str(value))
+        if match is None:
+            raise FastValidationError("expected a Python version for `min_python_version`")
+        validated["min_python_version"] = [int(group) for group in match.group(1, 2, 3)]
+    for key in ("hidden", "disabled"):
+        if not isinstance(validated[key], bool):
+            raise FastValidationError(f"expected a bool for `{key}`")
+    if validated["type"] not in ("COG", "SHARED_LIBRARY"):
+        raise FastValidationError("unexpected value for `type`")
+
+
+def _validate_repo(section: typing.Any) -> dict:
+    validated = _prepare_section(section, _REPO_SPEC)
+    for key in ("name", "short", "description", "install_msg"):
+        _validate_str(validated, key)
+    _validate_str_list(validated, "author")
+    return validated
+
+
+def _validate_shared(section: typing.Any) -> dict:
+    validated = _prepare_section(section, _SHARED_FIELDS_SPEC)
+    _validate_str(validated, "install_msg")
+    _validate_str_list(validated, "author")
+    _validate_common_keys(validated)
+    return validated
+
+
+def _validate_cog(section: typing.Any) -> dict:
+    validated = _prepare_section(section, _COG_SPEC)
+    for key in ("name", "short", "description", "end_user_data_statement"):
+        _validate_str(validated, key)
+    for key in ("class_docstring", "install_msg"):
+        if key in validated:
+            _validate_str(validated, key)
+    if "author" in validated:
+        _validate_str_list(validated, "author")
+    required_cogs = validated["required_cogs"]
+    if not isinstance(required_cogs, dict) or not all(
+        isinstance(key, str) and isinstance(value, str)
+        for key, value in required_cogs.items()
+    ):
+        raise FastValidationError("expected a mapping of strings for `required_cogs`")
+    _validate_str_list(validated, "requirements")
+    _validate_str_list(validated, "tags")
+    _validate_common_keys(validated)
+    return validated
+
+
+def _fast_load(text: str) -> typing.Optional[dict]:
+    """Parse `text` with a C-backed YAML loader and validate it in Python.
+
+    Returns `None` when parsing or validation fails so that the caller
+    can fall back to strictyaml for its friendlier error messages.
+    """
+    try:
+        raw = yaml.load(text, Loader=_YamlLoader)
+    except yaml.YAMLError:
+        return None
+    try:
+        if not isinstance(raw, dict) or raw.keys() != {"repo", "shared_fields", "cogs"}:
+            raise FastValidationError("expected `repo`, `shared_fields` and `cogs` sections")
+        if not isinstance(raw["cogs"], dict):
+            raise FastValidationError("expected a mapping in `cogs` section")
+        return {
+            "repo": _validate_repo(raw["repo"]),
+            "shared_fields": _validate_shared(raw["shared_fields"]),
+            "cogs": {
+                pkg_name: _validate_cog(cog_info)
+                for pkg_name, cog_info in raw["cogs"].items()
+            },
+        }
+    except FastValidationError:
+        return None
+
+
+_PARSO_GRAMMAR = parso.load_grammar()
+_PARSE_CACHE: typing.Dict[Path, typing.Tuple[float, parso.python.tree.Module, str]] = {}
+
+
+def _parse_cached(path: Path) -> typing.Tuple[parso.python.tree.Module, str]:
+    """Parse a file with parso, reusing the tree if the file hasn't changed."""
+    mtime = path.stat().st_mtime
+    hit = _PARSE_CACHE.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1], hit[2]
+    source = path.read_text(encoding="utf-8")
+    tree = _PARSO_GRAMMAR.parse(source)
+    _PARSE_CACHE[path] = (mtime, tree, source)
+    return tree, source
 
 
 def check_order(data: dict) -> int:
     """Temporary order checking, until strictyaml adds proper support for sorting."""
     to_check = {
-        "repo": AUTOLINT_REPO_KEYS_ORDER,
-        "shared_fields": AUTOLINT_SHARED_FIELDS_KEYS_ORDER,
+        "repo": AUTOLINT_REPO_RANK,
+        "shared_fields": AUTOLINT_SHARED_FIELDS_RANK,
     }
     exit_code = 0
-    for key, order in to_check.items():
+    for key, rank in to_check.items():
         section = data[key]
         original_keys = list(section.keys())
-        sorted_keys = sorted(section.keys(), key=order.index)
+        sorted_keys = sorted(section.keys(), key=rank.__getitem__)
         if original_keys != sorted_keys:
             print(
                 "\033[93m\033[1mWARNING:\033[0m "
@@ -209,7 +378,7 @@ def check_order(data: dict) -> int:
         # strictyaml breaks ordering of keys for some reason
         original_keys = [k for k, v in cog_info.items() if v]
         sorted_keys = sorted(
-            (k for k, v in cog_info.items() if v), key=AUTOLINT_COG_KEYS_ORDER.index
+            (k for k, v in cog_info.items() if v), key=AUTOLINT_COG_RANK.__getitem__
         )
         if original_keys != sorted_keys:
             print(
@@ -241,6 +410,68 @@ def check_order(data: dict) -> int:
     return exit_code
 
 
+def _update_class_docstring(pkg_name: str, cog_info: dict, repo_info: dict) -> int:
+    class_name = cog_info["name"]
+    path = ROOT_PATH / pkg_name / "__init__.py"
+    if not path.is_file():
+        raise RuntimeError("Folder `{pkg_name}` isn't a valid package.")
+    while True:
+        tree, source = _parse_cached(path)
+        class_node = next(
+            (node for node in tree.iter_classdefs() if node.name.value == class_name),
+            None,
+        )
+        if class_node is not None:
+            break
+
+        for import_node in tree.iter_imports():
+            if import_node.is_star_import():
+                # we're ignoring star imports
+                continue
+            for import_path in import_node.get_paths():
+                if import_path[-1].value == class_name:
+                    break
+            else:
+                continue
+
+            if import_node.level == 0:
+                raise RuntimeError("Script expected relative import of cog's class.")
+            if import_node.level > 1:
+                raise RuntimeError("Attempted relative import beyond top-level package.")
+            path = ROOT_PATH / pkg_name
+            for part in import_path[:-1]:
+                path /= part.value
+            path = path.with_suffix(".py")
+            if not path.is_file():
+                raise RuntimeError(
+                    f"Path `{path}` isn't a valid file. Finding cog's class failed."
+                )
+            break
+
+    doc_node = class_node.get_doc_node()
+    new_docstring = cog_info.get("class_docstring") or cog_info["short"]
+    replacements = {
+        "repo_name": repo_info["name"],
+        "cog_name": cog_info["name"],
+    }
+    new_docstring = new_docstring.format_map(replacements)
+    if doc_node is not None:
+        doc_node.value = f'"""{new_docstring}"""'
+    else:
+        first_leaf = class_node.children[-1].get_first_leaf()
+        # gosh, this is horrible
+        first_leaf.prefix = f'\n    """{new_docstring}"""\n'
+
+    new_code = tree.get_code()
+    if source != new_code:
+        print(f"Updated class docstring for {class_name}")
+        path.write_text(new_code, encoding="utf-8")
+        # the cached tree was mutated above - force a fresh parse on next use
+        _PARSE_CACHE.pop(path, None)
+
+    return 0
+
+
 def update_class_docstrings(cogs: dict, repo_info: dict) -> int:
     """Update class docstrings with descriptions from info.yaml
 
@@ -251,85 +482,28 @@ def update_class_docstrings(cogs: dict, repo_info: dict) -> int:
       `from .rlstats import RLStats` not `from . import rlstats`
       - import is relative
       - star imports are ignored
-    """
-    for pkg_name, cog_info in cogs.items():
-        class_name = cog_info["name"]
-        path = ROOT_PATH / pkg_name / "__init__.py"
-        if not path.is_file():
-            raise RuntimeError("Folder `{pkg_name}` isn't a valid package.")
-        while True:
-            with path.open(encoding="utf-8") as fp:
-                source = fp.read()
-                tree = parso.parse(source)
-            class_node = next(
-                (node for node in tree.iter_classdefs() if node.name.value == class_name),
-                None,
-            )
-            if class_node is not None:
-                break
-
-            for import_node in tree.iter_imports():
-                if import_node.is_star_import():
-                    # we're ignoring star imports
-                    continue
-                for import_path in import_node.get_paths():
-                    if import_path[-1].value == class_name:
-                        break
-                else:
-                    continue
-
-                if import_node.level == 0:
-                    raise RuntimeError("Script expected relative import of cog's class.")
-                if import_node.level > 1:
-                    raise RuntimeError("Attempted relative import beyond top-level package.")
-                path = ROOT_PATH / pkg_name
-                for part in import_path[:-1]:
-                    path /= part.value
-                path = path.with_suffix(".py")
-                if not path.is_file():
-                    raise RuntimeError(
-                        f"Path `{path}` isn't a valid file. Finding cog's class failed."
-                    )
-                break
-
-        doc_node = class_node.get_doc_node()
-        new_docstring = cog_info.get("class_docstring") or cog_info["short"]
-        replacements = {
-            "repo_name": repo_info["name"],
-            "cog_name": cog_info["name"],
-        }
-        new_docstring = new_docstring.format_map(replacements)
-        if doc_node is not None:
-            doc_node.value = f'"""{new_docstring}"""'
-        else:
-            first_leaf = class_node.children[-1].get_first_leaf()
-            # gosh, this is horrible
-            first_leaf.prefix = f'\n    """{new_docstring}"""\n'
 
-        new_code = tree.get_code()
-        if source != new_code:
-            print(f"Updated class docstring for {class_name}")
-            with path.open("w", encoding="utf-8") as fp:
-                fp.write(tree.get_code())
-
-    return 0
+    Packages are independent of each other, so they're processed in parallel.
+    """
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(_update_class_docstring, pkg_name, cog_info, repo_info)
+            for pkg_name, cog_info in cogs.items()
+        ]
+        return max((future.result() for future in futures), default=0)
 
 
 def check_cog_data_path_use(cogs: dict) -> int:
+    needle = b"cog_data_path"
     for pkg_name in cogs:
-        p = subprocess.run(
-            ("git", "grep", "-q", "cog_data_path", "--", f"{pkg_name}/"),
-            cwd=ROOT_PATH,
-            check=False,
-        )
-        if p.returncode == 0:
+        if any(
+            needle in file.read_bytes() for file in (ROOT_PATH / pkg_name).rglob("*.py")
+        ):
             print(
                 "\033[94m\033[1mINFO:\033[0m "
                 f"{pkg_name} uses cog_data_path, make sure"
                 " that you notify the user about it in install message."
             )
-        elif p.returncode != 1:
-            raise RuntimeError("git grep command failed")
     return 0
 
 
@@ -357,86 +531,107 @@ CONTAINERS_WITHOUT_LOCAL_SCOPE = (
 )
 
 
-def _scan_recursively(
-    children: typing.List[parso.tree.NodeOrLeaf], name: str, containers: typing.Set[str]
-):
-    for element in children:
-        if element.type == name:
-            yield element
-        if element.type in containers:
-            yield from _scan_recursively(element.children, name, containers)
+def _walk_collect(
+    children: typing.List[parso.tree.NodeOrLeaf], names: typing.Set[str]
+) -> typing.Dict[str, typing.List[parso.tree.NodeOrLeaf]]:
+    """Collect nodes of all wanted types in a single descent over the tree.
 
+    This replaces separate per-type walks - `name` nodes are only collected
+    while the descent hasn't entered a local scope, while other wanted types
+    are collected anywhere below the function containers.
+    """
+    found: typing.Dict[str, typing.List[parso.tree.NodeOrLeaf]] = {name: [] for name in names}
+    # bind the container sets to locals - this loop visits every node in the tree
+    containers = CONTAINERS
+    containers_without_local_scope = CONTAINERS_WITHOUT_LOCAL_SCOPE
+    stack = [(element, True, True) for element in reversed(children)]
+    while stack:
+        element, in_containers, module_scope = stack.pop()
+        element_type = element.type
+        if element_type in found:
+            if module_scope if element_type == "name" else in_containers:
+                found[element_type].append(element)
+        in_containers = in_containers and element_type in containers
+        module_scope = module_scope and element_type in containers_without_local_scope
+        if in_containers or module_scope:
+            stack.extend(
+                (child, in_containers, module_scope) for child in reversed(element.children)
+            )
+    return found
 
-def check_command_docstrings(cogs: dict) -> int:
+
+def _check_pkg_command_docstrings(pkg_name: str) -> int:
     ret = 0
-    for pkg_name in cogs:
-        pkg_folder = ROOT_PATH / pkg_name
-        for file in pkg_folder.glob("**/*.py"):
-            with file.open() as fp:
-                tree = parso.parse(fp.read())
-            for node in _scan_recursively(tree.children, "async_funcdef", CONTAINERS):
-                funcdef = node.children[-1]
-                decorators = funcdef.get_decorators()
-                ignore = False
-                # DEP-WARN: use of private method
-                for prefix_part in decorators[0].children[0]._split_prefix():
-                    if (
-                        prefix_part.type == "comment"
-                        and prefix_part.value == "# geninfo-ignore: missing-docstring"
-                    ):
-                        ignore = True
-                for deco in decorators:
-                    maybe_name = deco.children[1]
-                    if maybe_name.type == "dotted_name":
-                        it = (n.value for n in maybe_name.children)
-                        # ignore first item (can either be `commands` or `groupname`)
-                        next(it, None)
-                        deco_name = "".join(it)
-                    elif maybe_name.type == "name":
-                        deco_name = maybe_name.value
-                    else:
-                        raise RuntimeError("Unexpected type of decorator name.")
-                    if deco_name in {".command", ".group"}:
-                        break
+    pkg_folder = ROOT_PATH / pkg_name
+    for file in pkg_folder.glob("**/*.py"):
+        tree, _ = _parse_cached(file)
+        found = _walk_collect(tree.children, {"async_funcdef"})
+        for node in found["async_funcdef"]:
+            funcdef = node.children[-1]
+            decorators = funcdef.get_decorators()
+            ignore = False
+            # DEP-WARN: use of private method
+            for prefix_part in decorators[0].children[0]._split_prefix():
+                if (
+                    prefix_part.type == "comment"
+                    and prefix_part.value == "# geninfo-ignore: missing-docstring"
+                ):
+                    ignore = True
+            for deco in decorators:
+                maybe_name = deco.children[1]
+                if maybe_name.type == "dotted_name":
+                    it = (n.value for n in maybe_name.children)
+                    # ignore first item (can either be `commands` or `groupname`)
+                    next(it, None)
+                    deco_name = "".join(it)
+                elif maybe_name.type == "name":
+                    deco_name = maybe_name.value
                 else:
-                    continue
-                if funcdef.get_doc_node() is None:
-                    if not ignore:
-                        print(
-                            "\033[93m\033[1mWARNING:\033[0m "
-                            f"command `{funcdef.name.value}` misses help docstring!"
-                        )
-                        ret = 1
-                elif ignore:
+                    raise RuntimeError("Unexpected type of decorator name.")
+                if deco_name in {".command", ".group"}:
+                    break
+            else:
+                continue
+            if funcdef.get_doc_node() is None:
+                if not ignore:
                     print(
                         "\033[93m\033[1mWARNING:\033[0m "
-                        f"command `{funcdef.name.value}` has unused"
-                        " missing-docstring ignore comment!"
+                        f"command `{funcdef.name.value}` misses help docstring!"
                     )
                     ret = 1
+            elif ignore:
+                print(
+                    "\033[93m\033[1mWARNING:\033[0m "
+                    f"command `{funcdef.name.value}` has unused"
+                    " missing-docstring ignore comment!"
+                )
+                ret = 1
     return ret
 
 
-def check_for_end_user_data_statement(cogs: dict) -> int:
-    ret = 0
-    for pkg_name, cog_info in cogs.items():
-        path = ROOT_PATH / pkg_name / "__init__.py"
-        if not path.is_file():
-            raise RuntimeError("Folder `{pkg_name}` isn't a valid package.")
-        with path.open(encoding="utf-8") as fp:
-            source = fp.read()
-        tree = parso.parse(source)
-        for node in _scan_recursively(tree.children, "name", CONTAINERS_WITHOUT_LOCAL_SCOPE):
-            if node.value == "__red_end_user_data_statement__":
-                break
-        else:
-            print(
-                "\033[93m\033[1mWARNING:\033[0m "
-                f"cog package `{pkg_name}` is missing end user data statement!"
-            )
-            ret = 1
+def check_command_docstrings(cogs: dict) -> int:
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return max(executor.map(_check_pkg_command_docstrings, cogs), default=0)
 
-    return ret
+
+def _check_pkg_end_user_data_statement(pkg_name: str) -> int:
+    path = ROOT_PATH / pkg_name / "__init__.py"
+    if not path.is_file():
+        raise RuntimeError("Folder `{pkg_name}` isn't a valid package.")
+    # the name is unique enough that a substring scan answers this
+    # without paying for a full parse
+    if b"__red_end_user_data_statement__" not in path.read_bytes():
+        print(
+            "\033[93m\033[1mWARNING:\033[0m "
+            f"cog package `{pkg_name}` is missing end user data statement!"
+        )
+        return 1
+    return 0
+
+
+def check_for_end_user_data_statement(cogs: dict) -> int:
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return max(executor.map(_check_pkg_end_user_data_statement, cogs), default=0)
 
 
 MAX_RED_VERSIONS = {
@@ -444,11 +639,93 @@ MAX_RED_VERSIONS = {
 }
 MAX_PYTHON_VERSION = next(reversed(MAX_RED_VERSIONS))
 
+_COG_MENU_RE = re.compile(r"## Cog Menu\n{2}(.+)\n{2}## Contributing", flags=re.DOTALL)
+# many cogs share the same min_bot_version, so cache the parsed versions
+_version_info_from_str = functools.lru_cache(maxsize=None)(VersionInfo.from_str)
+
+
+@functools.lru_cache(maxsize=None)
+def _min_py_for_bot(min_bot_version: typing.Optional[str]) -> typing.Tuple[int, int]:
+    """Get the minimum Python version required by the given bot version."""
+    if min_bot_version is None:
+        return (3, 8)
+    red_version_info = _version_info_from_str(min_bot_version)
+    for python_version, max_red_version in MAX_RED_VERSIONS.items():
+        if max_red_version is None or red_version_info < max_red_version:
+            return python_version
+    return (3, 8)
+
+
+def _write_if_changed(path: Path, content: str) -> None:
+    """Write `content` to `path` unless the file already holds it.
+
+    Leaving an up-to-date file alone avoids needless CI cache invalidation.
+    """
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return
+    except FileNotFoundError:
+        pass
+    path.write_text(content, encoding="utf-8")
+
+
+def _emit_cog_info(
+    pkg_name: str,
+    cog_info: dict,
+    shared_fields: dict,
+    shared_fields_namespace: SimpleNamespace,
+    bundled_data_pkgs: typing.Set[str],
+    repo_info: dict,
+) -> typing.Tuple[int, int]:
+    """Write the cog's info.json and return its minimum Python version."""
+    min_python_version = _min_py_for_bot(
+        cog_info.get("min_bot_version", shared_fields.get("min_bot_version"))
+    )
+    python_version = cog_info.get("min_python_version", shared_fields.get("min_python_version"))
+    if python_version is not None and min_python_version < python_version:
+        min_python_version = python_version
+
+    print(f"Preparing info.json for {pkg_name} cog...")
+    output = {}
+    for key in AUTOLINT_COG_KEYS_ORDER:
+        if key in SKIP_COG_KEYS_INFO_JSON:
+            continue
+        value = cog_info.get(key)
+        if value is None:
+            value = shared_fields.get(key)
+        if value is None:
+            continue
+        output[key] = value
+    replacements = {
+        "repo_name": repo_info["name"],
+        "cog_name": output["name"],
+    }
+    if pkg_name in bundled_data_pkgs:
+        new_msg = f"{output['install_msg']}\n\nThis cog comes with bundled data."
+        output["install_msg"] = new_msg
+    for to_replace in ("short", "description", "install_msg"):
+        output[to_replace] = _format_shared_fields(output[to_replace], shared_fields_namespace)
+        if to_replace == "description":
+            output[to_replace] = output[to_replace].format_map(
+                {**replacements, "short": output["short"]}
+            )
+        else:
+            output[to_replace] = output[to_replace].format_map(replacements)
+
+    (ROOT_PATH / pkg_name / "info.json").write_text(
+        json.dumps(output, indent=4), encoding="utf-8"
+    )
+
+    return min_python_version
+
 
 def main() -> int:
     print("Loading info.yaml...")
-    with open(ROOT_PATH / "info.yaml", encoding="utf-8") as fp:
-        data = yaml_load(fp.read(), SCHEMA).data
+    text = (ROOT_PATH / "info.yaml").read_text(encoding="utf-8")
+    data = _fast_load(text)
+    if data is None:
+        # slow path - let strictyaml report what exactly is wrong with the document
+        data = yaml_load(text, SCHEMA).data
 
     print("Checking order in sections...")
     exit_code = check_order(data)
@@ -458,8 +735,7 @@ def main() -> int:
     repo_info["install_msg"] = repo_info["install_msg"].format_map(
         {"repo_name": repo_info["name"]}
     )
-    with open(ROOT_PATH / "info.json", "w", encoding="utf-8") as fp:
-        json.dump(repo_info, fp, indent=4)
+    (ROOT_PATH / "info.json").write_text(json.dumps(repo_info, indent=4), encoding="utf-8")
 
     all_requirements: typing.Set[str] = set()
     requirements: typing.Dict[typing.Tuple[int, int], typing.Set[str]] = {
@@ -473,26 +749,30 @@ def main() -> int:
     }
     print("Preparing info.json files for cogs...")
     shared_fields = data["shared_fields"]
-    global_min_bot_version = shared_fields.get("min_bot_version")
-    global_min_python_version = shared_fields.get("min_python_version")
     cogs = data["cogs"]
-    for pkg_name, cog_info in cogs.items():
+    # these are the same for every cog, so compute them once
+    shared_fields_namespace = SimpleNamespace(**shared_fields)
+    bundled_data_pkgs = {
+        entry.name
+        for entry in os.scandir(ROOT_PATH)
+        if entry.is_dir() and (Path(entry.path) / "data").is_dir()
+    }
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        min_python_versions = list(
+            executor.map(
+                lambda item: _emit_cog_info(
+                    item[0],
+                    item[1],
+                    shared_fields,
+                    shared_fields_namespace,
+                    bundled_data_pkgs,
+                    repo_info,
+                ),
+                cogs.items(),
+            )
+        )
+    for (pkg_name, cog_info), min_python_version in zip(cogs.items(), min_python_versions):
         all_requirements.update(cog_info["requirements"])
-        min_bot_version = cog_info.get("min_bot_version", global_min_bot_version)
-        min_python_version = (3, 8)
-        if min_bot_version is not None:
-            red_version_info = VersionInfo.from_str(min_bot_version)
-            for python_version, max_red_version in MAX_RED_VERSIONS.items():
-                if max_red_version is None:
-                    min_python_version = python_version
-                    break
-                if red_version_info >= max_red_version:
-                    continue
-                min_python_version = python_version
-                break
-        python_version = cog_info.get("min_python_version", global_min_python_version)
-        if python_version is not None and min_python_version < python_version:
-            min_python_version = python_version
         for python_version, reqs in requirements.items():
             if python_version >= min_python_version:
                 reqs.update(cog_info["requirements"])
@@ -503,86 +783,46 @@ def main() -> int:
                 file_list.append(pkg_name)
         black_file_list[min_python_version].append(pkg_name)
 
-        print(f"Preparing info.json for {pkg_name} cog...")
-        output = {}
-        for key in AUTOLINT_COG_KEYS_ORDER:
-            if key in SKIP_COG_KEYS_INFO_JSON:
-                continue
-            value = cog_info.get(key)
-            if value is None:
-                value = shared_fields.get(key)
-            if value is None:
-                continue
-            output[key] = value
-        replacements = {
-            "repo_name": repo_info["name"],
-            "cog_name": output["name"],
-        }
-        shared_fields_namespace = SimpleNamespace(**shared_fields)
-        maybe_bundled_data = ROOT_PATH / pkg_name / "data"
-        if maybe_bundled_data.is_dir():
-            new_msg = f"{output['install_msg']}\n\nThis cog comes with bundled data."
-            output["install_msg"] = new_msg
-        for to_replace in ("short", "description", "install_msg"):
-            output[to_replace] = safe_format_alt(
-                output[to_replace], {"shared_fields": shared_fields_namespace}
-            )
-            if to_replace == "description":
-                output[to_replace] = output[to_replace].format_map(
-                    {**replacements, "short": output["short"]}
-                )
-            else:
-                output[to_replace] = output[to_replace].format_map(replacements)
-
-        with open(ROOT_PATH / pkg_name / "info.json", "w", encoding="utf-8") as fp:
-            json.dump(output, fp, indent=4)
-
     print("Preparing requirements file for CI...")
-    with open(ROOT_PATH / ".ci/requirements/all_cogs.txt", "w", encoding="utf-8") as fp:
-        fp.write("Red-DiscordBot\n")
-        for requirement in sorted(all_requirements):
-            fp.write(f"{requirement}\n")
+    _write_if_changed(
+        ROOT_PATH / ".ci/requirements/all_cogs.txt",
+        "\n".join(["Red-DiscordBot", *sorted(all_requirements)]) + "\n",
+    )
     for python_version, reqs in requirements.items():
         folder_name = f"py{''.join(map(str, python_version))}"
-        with open(
+        _write_if_changed(
             ROOT_PATH / f".ci/{folder_name}/requirements/all_cogs.txt",
-            "w",
-            encoding="utf-8",
-        ) as fp:
-            fp.write("Red-DiscordBot\n")
-            for req in sorted(reqs):
-                fp.write(f"{req}\n")
-        with open(
-            ROOT_PATH / f".ci/{folder_name}/black_file_list.txt", "w", encoding="utf-8"
-        ) as fp:
-            fp.write(" ".join(sorted(black_file_list[python_version])))
-        with open(
+            "\n".join(["Red-DiscordBot", *sorted(reqs)]) + "\n",
+        )
+        _write_if_changed(
+            ROOT_PATH / f".ci/{folder_name}/black_file_list.txt",
+            " ".join(sorted(black_file_list[python_version])),
+        )
+        _write_if_changed(
             ROOT_PATH / f".ci/{folder_name}/compileall_file_list.txt",
-            "w",
-            encoding="utf-8",
-        ) as fp:
-            fp.write(" ".join(sorted(compileall_file_list[python_version])))
+            " ".join(sorted(compileall_file_list[python_version])),
+        )
 
     print("Preparing all cogs list in README.md...")
-    with open(ROOT_PATH / "README.md", "r+", encoding="utf-8") as fp:
-        text = fp.read()
-        match = re.search(r"## Cog Menu\n{2}(.+)\n{2}## Contributing", text, flags=re.DOTALL)
-        if match is None:
-            print("\033[91m\033[1mERROR:\033[0m Couldn't find cogs sections in README.md!")
-            return 1
-        start, end = match.span(1)
-        lines = ["---\n| Name | Description |\n| --- | --- |"]
-        for pkg_name, cog_info in cogs.items():
-            replacements = {
-                "repo_name": repo_info["name"],
-                "cog_name": cog_info["name"],
-            }
-            desc = cog_info["short"].format_map(replacements)
-            lines.append(f"| {pkg_name} | {desc} |")
-        cogs_section = "\n".join(lines)
-        fp.seek(0)
-        fp.truncate()
-        fp.write(f"{text[:start]}{cogs_section}{text[end:]}")
+    readme_path = ROOT_PATH / "README.md"
+    text = readme_path.read_text(encoding="utf-8")
+    match = _COG_MENU_RE.search(text)
+    if match is None:
+        print("\033[91m\033[1mERROR:\033[0m Couldn't find cogs sections in README.md!")
+        return 1
+    start, end = match.span(1)
+    repo_name = repo_info["name"]
+    lines = ["---\n| Name | Description |\n| --- | --- |"]
+    for pkg_name, cog_info in cogs.items():
+        desc = cog_info["short"].format_map(
+            {"repo_name": repo_name, "cog_name": cog_info["name"]}
+        )
+        lines.append(f"| {pkg_name} | {desc} |")
+    cogs_section = "\n".join(lines)
+    new_text = f"{text[:start]}{cogs_section}{text[end:]}"
+    # don't bump the file's mtime when the cogs list is already up to date
+    if new_text != text:
+        readme_path.write_text(new_text, encoding="utf-8")
 
     print("Updating class docstrings...")
     update_class_docstrings(cogs, repo_info)